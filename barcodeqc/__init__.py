@@ -1,6 +1,28 @@
-from importlib.metadata import version
+import sys
+import types
 
-from .qc import qc
+from importlib.metadata import version
 
 __all__ = ["qc"]
 __version__ = version("barcodeqc")
+
+
+def __getattr__(name: str):
+    # Defer the pipeline (and its pandas/plotly imports) until first use.
+    if name == "qc":
+        from .qc import qc
+
+        return qc
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+class _Package(types.ModuleType):
+    def __setattr__(self, name, value):
+        # Importing the barcodeqc.qc submodule binds it as `qc` on the
+        # package; keep the pipeline function as the public export instead.
+        if name == "qc" and isinstance(value, types.ModuleType):
+            value = value.qc
+        super().__setattr__(name, value)
+
+
+sys.modules[__name__].__class__ = _Package
@@ -9,6 +9,7 @@ print commands instead of executing them.
 from __future__ import annotations
 
 import argparse
+import functools
 import logging
 import os
 import subprocess
@@ -16,18 +17,16 @@ import warnings
 
 from pathlib import Path
 from importlib.metadata import version
+from typing import TYPE_CHECKING
 
-import pandas as pd
-
-from barcodeqc import qc
 from barcodeqc.config import output_dir_from_sample_name
 from barcodeqc.files import BarcodeFileError, WildcardFileError
 from barcodeqc.logging import setup_logging
+from barcodeqc.paths import BARCODE_SETS
 from barcodeqc.utils import ExternalDependencyError
 
-warnings.filterwarnings('ignore', category=FutureWarning)
-
-logging.getLogger('matplotlib').setLevel(logging.WARNING)
+if TYPE_CHECKING:
+    import pandas as pd
 
 EX_OK = getattr(os, "EX_OK", 0)
 EX_USAGE = getattr(os, "EX_USAGE", 64)
@@ -56,6 +55,13 @@ def _exit_code_for_exception(exc: Exception) -> int:
     return EX_SOFTWARE
 
 
+def qc(**kwargs) -> Path:
+    """Run the QC pipeline; imported on first use to keep CLI startup cheap."""
+    from barcodeqc.qc import qc as run_qc
+
+    return run_qc(**kwargs)
+
+
 def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
         prog="barcodeqc",
@@ -92,10 +98,8 @@ def build_parser() -> argparse.ArgumentParser:
         "barcode_set",
         type=str,
         metavar="barcode_set",
-        choices=[
-            "bc50", "bc96", "fg96", "bc220", "bc220_05-OCT", "bc220_20-MAY"
-        ],
-        help="Barcode Set: bc50|bc96|fg96|bc220|bc220_05-OCT|bc220_20|"
+        choices=BARCODE_SETS,
+        help=f"Barcode Set: {'|'.join(BARCODE_SETS)}"
     )
     qc_parser.add_argument(
         "-r",
@@ -164,9 +168,47 @@ def build_parser() -> argparse.ArgumentParser:
     return parser
 
 
+@functools.lru_cache(maxsize=1)
+def _cached_parser() -> argparse.ArgumentParser:
+    return build_parser()
+
+
 def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
-    parser = build_parser()
-    return parser.parse_args(argv)
+    parser = _cached_parser()
+    args = parser.parse_args(argv)
+    # Resolve once; run() and main() both need it.
+    args.output_dir = output_dir_from_sample_name(args.sample_name)
+    return args
+
+
+def _list_figures(directory: Path) -> list[Path] | None:
+    """Return the .html then .png files in `directory` from a single scan, or
+    None if the directory does not exist.
+    """
+    html: list[Path] = []
+    png: list[Path] = []
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.name.endswith(".html"):
+                    html.append(Path(entry.path))
+                elif entry.name.endswith(".png"):
+                    png.append(Path(entry.path))
+    except FileNotFoundError:
+        return None
+    return html + png
+
+
+def _read_first_csv(*candidates: Path) -> pd.DataFrame | None:
+    """Read the first candidate CSV that exists; None if none do."""
+    import pandas as pd
+
+    for path in candidates:
+        try:
+            return pd.read_csv(path)
+        except FileNotFoundError:
+            continue
+    return None
 
 
 def main(args: argparse.Namespace) -> int:
@@ -174,6 +216,15 @@ def main(args: argparse.Namespace) -> int:
     logger.info("CLI started")
     logger.debug("args: %s", vars(args))
 
+    # parse_args() resolves this; fall back for Namespaces built elsewhere.
+    output_dir = (
+        getattr(args, "output_dir", None)
+        or output_dir_from_sample_name(args.sample_name)
+    )
+
+    # Only silence pandas/plotly FutureWarnings once real work is about to run.
+    warnings.filterwarnings('ignore', category=FutureWarning)
+
     if args.command == "report":
         import barcodeqc.report as report
 
@@ -181,26 +232,23 @@ def main(args: argparse.Namespace) -> int:
         if not sample_dir.exists():
             raise FileNotFoundError(f"Sample directory not found: {sample_dir}")
 
-        out_dir = output_dir_from_sample_name(args.sample_name)
+        out_dir = output_dir
         out_dir.mkdir(parents=True, exist_ok=True)
 
         figures_dir = sample_dir / "figures"
         tables_dir = sample_dir / "tables"
-        if figures_dir.exists():
-            figures = list(figures_dir.glob("*.html"))
-            figures += list(figures_dir.glob("*.png"))
-        else:
-            figures = list(sample_dir.glob("*.html"))
-            figures += list(sample_dir.glob("*.png"))
-        summary_path = tables_dir / "qc_table.csv"
-        onoff_path = tables_dir / "onoff_tissue_table.csv"
-        if not summary_path.exists():
-            summary_path = sample_dir / "qc_table.csv"
-        if not onoff_path.exists():
-            onoff_path = sample_dir / "onoff_tissue_table.csv"
-
-        summary = pd.read_csv(summary_path) if summary_path.exists() else None
-        onoff = pd.read_csv(onoff_path) if onoff_path.exists() else None
+        figures = _list_figures(figures_dir)
+        if figures is None:
+            figures = _list_figures(sample_dir) or []
+
+        summary = _read_first_csv(
+            tables_dir / "qc_table.csv",
+            sample_dir / "qc_table.csv",
+        )
+        onoff = _read_first_csv(
+            tables_dir / "onoff_tissue_table.csv",
+            sample_dir / "onoff_tissue_table.csv",
+        )
 
         linker_metrics = report.load_linker_metrics_from_dir(sample_dir)
         input_params = report.load_input_params_from_dir(sample_dir)
@@ -224,7 +272,7 @@ def main(args: argparse.Namespace) -> int:
         logger.info("Report generated in %s", out_dir)
         return EX_OK
 
-    sample_dir = output_dir_from_sample_name(args.sample_name)
+    sample_dir = output_dir
     sample_dir.mkdir(parents=True, exist_ok=True)
 
     if not args.dry_run:
@@ -256,7 +304,7 @@ def run(argv: list[str] | None = None) -> int:
 
     log_dir = None
     if args.command == "qc":
-        log_dir = output_dir_from_sample_name(args.sample_name) / "logs"
+        log_dir = args.output_dir / "logs"
 
     setup_logging(
         log_file="barcodeqc.log",
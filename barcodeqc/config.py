@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 import logging
+import os
+import stat
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Literal, Optional
@@ -21,6 +23,16 @@ def output_dir_from_sample_name(sample_name: str) -> Path:
     return Path.cwd() / dir_name
 
 
+def _require_file(path: Path, missing_message: str) -> None:
+    # One stat both confirms the path exists and rules out a directory.
+    try:
+        st = os.stat(path)
+    except (FileNotFoundError, NotADirectoryError):
+        raise FileNotFoundError(missing_message) from None
+    if stat.S_ISDIR(st.st_mode):
+        raise IsADirectoryError(f"Expected a file, found a directory: {path}")
+
+
 @dataclass(frozen=True)
 class QCConfig:
     sample_name: str
@@ -47,7 +59,7 @@ class QCConfig:
     ) -> "QCConfig":
         output_dir = output_dir_from_sample_name(sample_name)
         if tissue_position_file is None:
-            tissue_position_file = paths.BARCODE_PATHS[barcode_set]["positions"]
+            tissue_position_file = paths.barcode_paths(barcode_set)["positions"]
         return cls(
             sample_name=sample_name,
             r2_path=r2_path,
@@ -59,16 +71,16 @@ class QCConfig:
         )
 
     def validate(self) -> None:
-        if not self.r2_path.exists():
-            raise FileNotFoundError(
-                f"fastq file path does not exist: {self.r2_path}"
-            )
+        _require_file(
+            self.r2_path,
+            f"fastq file path does not exist: {self.r2_path}",
+        )
         validate_r2_fastq_path(self.r2_path)
         if self.tissue_position_file is not None:
-            if not self.tissue_position_file.exists():
-                raise FileNotFoundError(
-                    f"Could not find tissue_postion file: {self.tissue_position_file}"
-                )
+            _require_file(
+                self.tissue_position_file,
+                f"Could not find tissue_postion file: {self.tissue_position_file}",
+            )
 
         # Ensure CLI dependencies installed in PATH
         seqtk = require_executable("seqtk")
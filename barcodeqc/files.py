@@ -1,12 +1,22 @@
+from __future__ import annotations
+
+import functools
 import logging
-import pandas as pd
 
 from pathlib import Path
+from typing import TYPE_CHECKING
 import re
 
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
 logger = logging.getLogger(__name__)
 
-WILDCARD_MER_PATTERN = re.compile(r"^[ACGTN]{8,}$")
+# A leading barcode and the whitespace separating it from the read name.
+_WILDCARD_PREFIX = r"([ACGTN]{8,})(?:\s+|$)"
+# Splits a wildcard line into (barcode or None, read name) in a single match.
+WILDCARD_LINE_PATTERN = re.compile(rf"\s*(?:{_WILDCARD_PREFIX})?(.*)")
 
 
 class BarcodeFileError(ValueError):
@@ -17,44 +27,226 @@ class WildcardFileError(ValueError):
     """Raised when a positions or barcode file fails validation."""
 
 
+@functools.cache
+def _csv_engine() -> str:
+    """Prefer pyarrow's multithreaded CSV reader when it is importable."""
+    try:
+        import pyarrow.csv  # noqa: F401
+    except ImportError:
+        return "c"
+    return "pyarrow"
+
+
+def _read_csv(path: Path, **kwargs) -> pd.DataFrame:
+    """pd.read_csv with the preferred engine. pyarrow rejects rows whose field
+    count differs from the first row, which the C engine pads (or trims via
+    usecols), so such files are re-read with the C engine.
+    """
+    import pandas as pd
+
+    engine = _csv_engine()
+    try:
+        return pd.read_csv(path, engine=engine, **kwargs)
+    except pd.errors.ParserError:
+        if engine == "c":
+            raise
+        return pd.read_csv(path, engine="c", **kwargs)
+
+
+def _check_string_column(values: pd.Series) -> None:
+    """Raise BarcodeFileError if any value in ``values`` is not a str."""
+    import pandas as pd
+
+    # hasnans and infer_dtype scan in C; only build the per-row mask to report
+    # a failure. NaN is checked separately because pandas' str dtype reports
+    # "string" even when missing values are present.
+    if not values.hasnans and pd.api.types.infer_dtype(values) in (
+        "string", "empty"
+    ):
+        return
+    bad = values[~values.map(lambda x: isinstance(x, str))]
+    raise BarcodeFileError(
+        f"Non-string barcodes detected (example: {bad.iloc[0]!r})"
+        "Please ensure you are using the correct tissue_postions file"
+    )
+
+
+def _invalid_barcode_mask(values: pd.Series, length: int) -> np.ndarray:
+    """Flag entries of ``values`` that are not exactly ``length`` characters of
+    A/T/C/G/N, using a byte lookup table instead of a regex per row.
+    """
+    import numpy as np
+
+    non_acgtn = np.ones(256, dtype=bool)
+    non_acgtn[np.frombuffer(b"ACGNT", dtype=np.uint8)] = False
+
+    invalid = values.str.len().to_numpy() != length
+    sized = values.to_numpy(dtype=object)[~invalid]
+    if sized.size:
+        # Non-ASCII characters become a single b"?" so row widths are kept.
+        buf = np.frombuffer(
+            "".join(sized).encode("ascii", "replace"), dtype=np.uint8
+        )
+        invalid[~invalid] = non_acgtn[buf].reshape(-1, length).any(axis=1)
+    return invalid
+
+
+def _validate_nonneg_int(
+    values: pd.Series,
+    name: str,
+    hint: str = "",
+) -> pd.Series:
+    """Return ``values`` as ints, raising BarcodeFileError unless every entry
+    is a non-negative integer.
+    """
+    import numpy as np
+    import pandas as pd
+
+    # Columns parsed as integers can only fail the sign check.
+    if pd.api.types.is_integer_dtype(values):
+        negative = values.to_numpy() < 0
+        if negative.any():
+            bad = values[negative].unique()[:5]
+            raise BarcodeFileError(
+                f"{name} column contains negative values. Examples: {bad}"
+                f"{hint}"
+            )
+        return values
+
+    arr = pd.to_numeric(values, errors="coerce").to_numpy(dtype=np.float64)
+    with np.errstate(invalid="ignore"):
+        ints = arr.astype(np.int64)
+
+    # NaN and fractional values never survive the int64 round trip, so one
+    # fused mask covers every failure; the per-case masks used for error
+    # messages are only built once something has failed.
+    if not ((ints != arr) | (ints < 0)).any():
+        return pd.Series(ints, index=values.index, name=values.name)
+
+    # non-numeric values
+    missing = np.isnan(arr)
+    if missing.any():
+        bad = values[missing].unique()[:5]
+        raise BarcodeFileError(
+            f"{name} column contains non-numeric values. Examples: {bad}"
+            f"{hint}"
+        )
+
+    # must be integer-valued
+    fractional = ints != arr
+    if fractional.any():
+        bad = pd.unique(arr[fractional])[:5]
+        raise BarcodeFileError(
+            f"{name} column must contain integer values. Examples: {bad}"
+            f"{hint}"
+        )
+
+    # must be non-negative
+    bad = pd.unique(arr[arr < 0])[:5]
+    raise BarcodeFileError(
+        f"{name} column contains negative values. Examples: {bad}"
+        f"{hint}"
+    )
+
+
+def _load_wc_file_arrow(wcPath) -> pd.DataFrame | None:
+    """Parse a wildcard file with pyarrow compute kernels; mirrors
+    WILDCARD_LINE_PATTERN. Returns None if pyarrow cannot split the file into
+    lines, so the caller can fall back to the line-by-line reader.
+    """
+    import numpy as np
+    import pandas as pd
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pv
+
+    try:
+        table = pv.read_csv(
+            wcPath,
+            read_options=pv.ReadOptions(column_names=["line"]),
+            # One column per line: no delimiter or quoting applies.
+            parse_options=pv.ParseOptions(
+                delimiter="\x1f", quote_char=False, escape_char=False
+            ),
+            convert_options=pv.ConvertOptions(
+                column_types={"line": pa.string()}
+            ),
+        )
+    except pa.ArrowInvalid:
+        return None
+
+    lines = pc.utf8_ltrim_whitespace(table.column("line"))
+    lines = lines.filter(pc.not_equal(lines, ""))
+
+    # Same shape as WILDCARD_LINE_PATTERN once leading whitespace is gone.
+    prefix = "^" + _WILDCARD_PREFIX
+    barcodes = pc.struct_field(
+        pc.extract_regex(lines, prefix.replace("(", "(?P<bc>", 1)), [0]
+    )
+    read_names = pc.replace_substring_regex(
+        lines, prefix, "", max_replacements=1
+    )
+    if pc.any(pc.and_(pc.is_valid(barcodes), pc.equal(read_names, ""))).as_py():
+        raise WildcardFileError(
+            "Cutadapt wildcard file contains empty read names."
+        )
+
+    table = pa.table(
+        {"8mer": pc.fill_null(barcodes, ""), "readName": read_names}
+    )
+    try:
+        str_dtype = pd.StringDtype("pyarrow", na_value=np.nan)
+    except TypeError:
+        # pandas < 2.3 has no na_value; its DataFrame default is object
+        # columns, which is what the line-by-line reader builds there too.
+        return table.to_pandas()
+    return table.to_pandas(types_mapper=lambda _: str_dtype)
+
+
 def load_wc_file(wcPath):
     '''Loads a space-delimited text file containing parsed read names from a
     fastq file.  Checks to see if one of the rows contains an 8mer barcode.  If
     it does, assumes the next column contains the read and and returns a
     DataFrame, with the columns renamed.
     '''
-    rows: list[dict[str, str]] = []
+    import pandas as pd
+
+    if _csv_engine() == "pyarrow":
+        wc_df = _load_wc_file_arrow(wcPath)
+        if wc_df is not None:
+            if len(wc_df) < 6:
+                raise WildcardFileError(
+                    "Fewer than 6 reads found in cutadapt wildcard file."
+                )
+            return wc_df
+
+    # Build the two columns directly rather than one dict per read.
+    barcodes: list[str] = []
+    read_names: list[str] = []
     with Path(wcPath).open(encoding="utf-8") as handle:
         for raw_line in handle:
-            line = raw_line.rstrip("\r\n")
-            stripped = line.lstrip()
-            if stripped == "":
-                continue
-
-            parts = stripped.split(maxsplit=1)
-            first = parts[0]
-            remainder = parts[1] if len(parts) > 1 else ""
-
-            if WILDCARD_MER_PATTERN.fullmatch(first):
-                barcode = first
-                read_name = remainder
-            else:
-                barcode = ""
-                read_name = stripped
+            barcode, read_name = WILDCARD_LINE_PATTERN.match(
+                raw_line.rstrip("\r\n")
+            ).groups()
 
-            if read_name == "":
+            if barcode is None:
+                if read_name == "":
+                    continue
+                barcode = ""
+            elif read_name == "":
                 raise WildcardFileError(
                     "Cutadapt wildcard file contains empty read names."
                 )
 
-            rows.append({"8mer": barcode, "readName": read_name})
+            barcodes.append(barcode)
+            read_names.append(read_name)
 
-    if len(rows) < 6:
+    if len(read_names) < 6:
         raise WildcardFileError(
             "Fewer than 6 reads found in cutadapt wildcard file."
         )
 
-    return pd.DataFrame(rows, columns=["8mer", "readName"])
+    return pd.DataFrame({"8mer": barcodes, "readName": read_names})
 
 
 def open_barcode_file(bc_path: Path) -> pd.DataFrame:
@@ -75,8 +267,16 @@ def open_barcode_file(bc_path: Path) -> pd.DataFrame:
         Validated positions table with columns:
         ['sequence', 'row', 'col']
     """
+    # The cached table is shared, so hand each caller its own copy.
+    return _read_barcode_file(bc_path).copy()
+
 
-    barcodes = pd.read_csv(bc_path, header=0)
+@functools.lru_cache(maxsize=16)
+def _read_barcode_file(bc_path: Path) -> pd.DataFrame:
+    """Parse and validate a barcode file once per path; the bundled barcode
+    sets are static, and qc() and the report both read them.
+    """
+    barcodes = _read_csv(bc_path, header=0)
 
     if barcodes.shape[1] < 3:
         raise BarcodeFileError(
@@ -88,16 +288,10 @@ def open_barcode_file(bc_path: Path) -> pd.DataFrame:
 
     # must be string-like
     seq = barcodes["sequence"]
-    if not seq.map(lambda x: isinstance(x, str)).all():
-        bad = barcodes.loc[~seq.map(lambda x: isinstance(x, str)), "sequence"]
-        raise BarcodeFileError(
-            f"Non-string barcodes detected (example: {bad.iloc[0]!r})"
-            "Please ensure you are using the correct tissue_postions file"
-        )
+    _check_string_column(seq)
 
     # must be exactly 8 chars of A,T,C,G,N
-    pattern = r"^[ATCGN]{8}$"
-    invalid = ~barcodes["sequence"].astype(str).str.contains(pattern)
+    invalid = _invalid_barcode_mask(seq, 8)
 
     if invalid.any():
         bad = seq[invalid].unique()[:5]
@@ -108,31 +302,7 @@ def open_barcode_file(bc_path: Path) -> pd.DataFrame:
         )
 
     for c in ["row", "col"]:
-        vals = pd.to_numeric(barcodes[c], errors="coerce")
-
-        # non-numeric values
-        if vals.isna().any():
-            bad = barcodes.loc[vals.isna(), c].unique()[:5]
-            raise BarcodeFileError(
-                f"{c} column contains non-numeric values. Examples: {bad}"
-            )
-
-        # must be integer-valued
-        if (vals % 1 != 0).any():
-            bad = vals[vals % 1 != 0].unique()[:5]
-            raise BarcodeFileError(
-                f"{c} column must contain integer values. Examples: {bad}"
-            )
-
-        # must be non-negative
-        if (vals < 0).any():
-            bad = vals[vals < 0].unique()[:5]
-            raise BarcodeFileError(
-                f"{c} column contains negative values. Examples: {bad}"
-            )
-
-        # assign cleaned column back
-        barcodes[c] = vals.astype(int)
+        barcodes[c] = _validate_nonneg_int(barcodes[c], c)
 
     return barcodes
 
@@ -152,43 +322,45 @@ def open_positions_file(position_path: Path) -> pd.DataFrame:
         Validated positions table with columns:
         ['barcodes', 'on_off', 'row', 'col']
     """
-
-    positions = pd.read_csv(position_path, header=None)
-
-    if positions.shape[1] < 4:
+    import pandas as pd
+
+    # Only the first four columns are used; don't parse the rest.
+    try:
+        positions = _read_csv(position_path, header=None, usecols=range(4))
+    except (KeyError, ValueError) as exc:
+        found = pd.read_csv(position_path, header=None, nrows=1).shape[1]
+        if found >= 4:
+            raise BarcodeFileError(
+                f"Could not parse positions file: {exc}"
+                "Please ensure you are using the correct tissue_postions file"
+            ) from exc
         raise BarcodeFileError(
             f"Positions file must have at least 4 columns; "
-            f"found {positions.shape[1]}"
+            f"found {found}"
             "Please ensure you are using the correct tissue_postions file"
-        )
+        ) from None
 
-    positions = positions.iloc[:, :4]
     positions.columns = ["barcodes", "on_off", "row", "col"]
 
     # must be string-like
     bc = positions["barcodes"]
-    if not bc.map(lambda x: isinstance(x, str)).all():
-        bad = positions.loc[~bc.map(lambda x: isinstance(x, str)), "barcodes"]
-        raise BarcodeFileError(
-            f"Non-string barcodes detected (example: {bad.iloc[0]!r})"
-            "Please ensure you are using the correct tissue_postions file"
-        )
+    _check_string_column(bc)
 
-    # remove trailing "-1" only if it is at the end
-    positions["barcodes"] = (
-        positions["barcodes"]
-        .astype(str)
-        .str.replace(r"-1$", "", regex=True)
-    )
+    # remove trailing "-1" only if it is at the end; newer positions files
+    # have no suffix, so skip the rewrite entirely when nothing matches.
+    barcodes = bc
+    has_suffix = barcodes.str.endswith("-1")
+    if has_suffix.any():
+        barcodes = barcodes.str[:-2].where(has_suffix, barcodes)
+    positions["barcodes"] = barcodes
 
-    # must be exactly 8 chars of A,T,C,G,N
-    pattern = r"^[ATCGN]{16}$"
-    invalid = ~positions["barcodes"].astype(str).str.contains(pattern)
+    # must be exactly 16 chars of A,T,C,G,N
+    invalid = _invalid_barcode_mask(positions["barcodes"], 16)
 
     if invalid.any():
         bad = bc[invalid].unique()[:5]
         raise BarcodeFileError(
-            f"Invalid barcodes detected (expected 8-mer of A/T/C/G/N). "
+            f"Invalid barcodes detected (expected 16-mer of A/T/C/G/N). "
             f"Examples: {bad}"
             "Please ensure you are using the correct tissue_postions file"
         )
@@ -207,33 +379,10 @@ def open_positions_file(position_path: Path) -> pd.DataFrame:
     positions["on_off"] = on_off.astype(int)
 
     for c in ["row", "col"]:
-        vals = pd.to_numeric(positions[c], errors="coerce")
-
-        # non-numeric values
-        if vals.isna().any():
-            bad = positions.loc[vals.isna(), c].unique()[:5]
-            raise BarcodeFileError(
-                f"{c} column contains non-numeric values. Examples: {bad}"
-                "Please ensure you are using the correct tissue_postions file"
-            )
-
-        # must be integer-valued
-        if (vals % 1 != 0).any():
-            bad = vals[vals % 1 != 0].unique()[:5]
-            raise BarcodeFileError(
-                f"{c} column must contain integer values. Examples: {bad}"
-                "Please ensure you are using the correct tissue_postions file"
-            )
-
-        # must be non-negative
-        if (vals < 0).any():
-            bad = vals[vals < 0].unique()[:5]
-            raise BarcodeFileError(
-                f"{c} column contains negative values. Examples: {bad}"
-                "Please ensure you are using the correct tissue_postions file"
-            )
-
-        # assign cleaned column back
-        positions[c] = vals.astype(int)
+        positions[c] = _validate_nonneg_int(
+            positions[c],
+            c,
+            hint="Please ensure you are using the correct tissue_postions file",
+        )
 
     return positions
@@ -1,11 +1,127 @@
+import atexit
 import logging
+import logging.handlers
+import multiprocessing
 import sys
+import threading
 
 from datetime import datetime
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
+# Background thread that drains queued records into the log file. The queue
+# is a multiprocessing one so worker processes can feed the same listener.
+_file_listener: logging.handlers.QueueListener | None = None
+_file_queue_handler: logging.handlers.QueueHandler | None = None
+_stdout_level = logging.INFO
+
+_LOG_FORMAT = "%(levelname)s - %(asctime)s - %(message)s"
+_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+class _TimedMemoryHandler(logging.handlers.MemoryHandler):
+    """MemoryHandler that also flushes its buffer every `interval` seconds,
+    so a killed run still leaves a log file that is at most that far behind.
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        flushLevel: int,
+        target: logging.Handler,
+        interval: float = 1.0,
+    ) -> None:
+        super().__init__(capacity, flushLevel=flushLevel, target=target)
+        self._closed = threading.Event()
+        self._flusher = threading.Thread(
+            target=self._flush_periodically,
+            args=(interval,),
+            name="barcodeqc-log-flush",
+            daemon=True,
+        )
+        self._flusher.start()
+
+    def _flush_periodically(self, interval: float) -> None:
+        while not self._closed.wait(interval):
+            self.flush()
+
+    def close(self) -> None:
+        self._closed.set()
+        self._flusher.join()
+        super().close()
+
+
+def _stop_file_listener() -> None:
+    """Drain, stop and close the log-file listener, if one is running."""
+    global _file_listener, _file_queue_handler
+    if _file_queue_handler is not None:
+        logging.getLogger().removeHandler(_file_queue_handler)
+        _file_queue_handler = None
+    if _file_listener is not None:
+        _file_listener.stop()
+        _file_listener.queue.close()
+        _file_listener.queue.join_thread()
+        for handler in _file_listener.handlers:
+            # MemoryHandler.close() flushes and then drops its target.
+            target = getattr(handler, "target", None)
+            handler.close()
+            if target is not None:
+                target.close()
+        _file_listener = None
+
+
+def _process_context() -> multiprocessing.context.BaseContext:
+    """Start method for worker processes. Forking would copy a process whose
+    log listener and queue feeder threads are running, so workers start from
+    a clean process; the log queue is created from the same context.
+    """
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("forkserver")
+    return multiprocessing.get_context("spawn")
+
+
+def _init_worker_logging(
+    log_queue: multiprocessing.Queue, level: int, stdout_level: int
+) -> None:
+    """ProcessPoolExecutor initializer that sends a worker's records to the
+    parent's log-file listener.
+    """
+    root = logging.getLogger()
+    root.setLevel(logging.DEBUG)
+    # A forked worker inherits the parent's handlers; replace its queue
+    # handler so there is exactly one route to the file.
+    for handler in list(root.handlers):
+        if isinstance(handler, logging.handlers.QueueHandler):
+            root.removeHandler(handler)
+    qh = logging.handlers.QueueHandler(log_queue)
+    qh.setLevel(level)
+    root.addHandler(qh)
+
+    # Spawned workers start without the parent's stdout handler.
+    if not root.handlers[:-1]:
+        sh = logging.StreamHandler(sys.stdout)
+        sh.setLevel(stdout_level)
+        sh.setFormatter(logging.Formatter(_LOG_FORMAT, _DATE_FORMAT))
+        root.addHandler(sh)
+
+
+def worker_pool_kwargs() -> dict:
+    """Keyword arguments for ProcessPoolExecutor: the worker start method and,
+    if file logging is set up, an initializer so workers log to the file.
+    """
+    kwargs: dict = {"mp_context": _process_context()}
+    if _file_listener is None or _file_queue_handler is None:
+        return kwargs
+    kwargs["initializer"] = _init_worker_logging
+    kwargs["initargs"] = (
+        _file_listener.queue, _file_queue_handler.level, _stdout_level
+    )
+    return kwargs
+
+
+atexit.register(_stop_file_listener)
+
 
 def format_wildcard_metrics(
     wc_name: str,
@@ -58,15 +174,20 @@ def setup_logging(
     Configure application-wide logging.
 
     This should be called exactly once, at CLI startup.
+
+    Records bound for the log file are handed to a queue and written by a
+    background listener thread, so file I/O stays off the calling thread.
+    stdout is written directly to keep it ordered with printed tables.
     """
+    global _file_listener, _file_queue_handler, _stdout_level
+
     logger = logging.getLogger()
     logger.setLevel(logging.DEBUG)
     logger.handlers.clear()
+    _stop_file_listener()
 
-    formatter = logging.Formatter(
-        "%(levelname)s - %(asctime)s - %(message)s",
-        "%Y-%m-%d %H:%M:%S",
-    )
+    formatter = logging.Formatter(_LOG_FORMAT, _DATE_FORMAT)
+    _stdout_level = stdout_level
 
     # stdout
     sh = logging.StreamHandler(sys.stdout)
@@ -86,4 +207,21 @@ def setup_logging(
         fh = logging.FileHandler(log_file)
         fh.setLevel(file_level)
         fh.setFormatter(formatter)
-        logger.addHandler(fh)
+
+        # Batch file writes instead of write+flush per record; the buffer is
+        # flushed every second, and anything at ERROR or above straight away.
+        buffered = _TimedMemoryHandler(
+            capacity=1024, flushLevel=logging.ERROR, target=fh
+        )
+        buffered.setLevel(file_level)
+
+        log_queue: multiprocessing.Queue = _process_context().Queue()
+        qh = logging.handlers.QueueHandler(log_queue)
+        qh.setLevel(file_level)
+        logger.addHandler(qh)
+        _file_queue_handler = qh
+
+        _file_listener = logging.handlers.QueueListener(
+            log_queue, buffered, respect_handler_level=True
+        )
+        _file_listener.start()
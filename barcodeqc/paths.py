@@ -1,4 +1,8 @@
+import functools
+
+from collections.abc import Iterator, Mapping
 from pathlib import Path
+from types import MappingProxyType
 
 from importlib.resources import files as files
 
@@ -11,35 +15,64 @@ DATA_DIRS = {
     "barcodes": DATA_DIR / "barcode_files",
 }
 
-BARCODE_PATHS = {
-    "bc50": {
-        "positions": DATA_DIRS["positions"] / "x50_all_tissue_positions_list.csv",
-        "bca": DATA_DIRS["barcodes"] / "barcode_A" / "merList50.tsv",
-        "bcb": DATA_DIRS["barcodes"] / "barcode_B" / "merList50.tsv"
-    },
-    "bc96": {
-        "positions": DATA_DIRS["positions"] / "x96_all_tissue_positions_list.csv",
-        "bca": DATA_DIRS["barcodes"] / "barcode_A" / "merList96.tsv",
-        "bcb": DATA_DIRS["barcodes"] / "barcode_B" / "merList96.tsv"
-    },
-    "fg96": {
-        "positions": DATA_DIRS["positions"] / "xfg96_11DEC_alltissue_positions_list.csv",
-        "bca": DATA_DIRS["barcodes"] / "barcode_A" / "merListfg96.tsv",
-        "bcb": DATA_DIRS["barcodes"] / "barcode_B" / "merListfg96.tsv"
-    },
-    "bc220": {
-        "positions": DATA_DIRS["positions"] / "xbc220_25APR_alltissue_positions_list.csv",
-        "bca": DATA_DIRS["barcodes"] / "barcode_A" / "merList220_25-APR.tsv",
-        "bcb": DATA_DIRS["barcodes"] / "barcode_B" / "merList220_25-APR.tsv"
-    },
-    "bc220_05-OCT": {
-        "positions": DATA_DIRS["positions"] / "xbc220_05OCT_alltissue_positions_list.csv",
-        "bca": DATA_DIRS["barcodes"] / "barcode_A" / "merList220_05-OCT.tsv",
-        "bcb": DATA_DIRS["barcodes"] / "barcode_B" / "merList220_05-OCT.tsv"
-    },
-    "bc220_20-MAY": {
-        "positions": DATA_DIRS["positions"] / "xbc220-20MAY_alltissue_positions_list.csv",
-        "bca": DATA_DIRS["barcodes"] / "barcode_A" / "merList220_20-MAY.tsv",
-        "bcb": DATA_DIRS["barcodes"] / "barcode_B" / "merList220_20-MAY.tsv"
-    }
-}
+
+def _barcode_entry(positions: str, merlist: str) -> MappingProxyType:
+    return MappingProxyType({
+        "positions": DATA_DIRS["positions"] / positions,
+        "bca": DATA_DIRS["barcodes"] / "barcode_A" / merlist,
+        "bcb": DATA_DIRS["barcodes"] / "barcode_B" / merlist,
+    })
+
+
+# Positions file and 8mer list for each barcode set; paths are only resolved
+# when a set is actually requested.
+_BARCODE_FILES = MappingProxyType({
+    "bc50": (
+        "x50_all_tissue_positions_list.csv",
+        "merList50.tsv",
+    ),
+    "bc96": (
+        "x96_all_tissue_positions_list.csv",
+        "merList96.tsv",
+    ),
+    "fg96": (
+        "xfg96_11DEC_alltissue_positions_list.csv",
+        "merListfg96.tsv",
+    ),
+    "bc220": (
+        "xbc220_25APR_alltissue_positions_list.csv",
+        "merList220_25-APR.tsv",
+    ),
+    "bc220_05-OCT": (
+        "xbc220_05OCT_alltissue_positions_list.csv",
+        "merList220_05-OCT.tsv",
+    ),
+    "bc220_20-MAY": (
+        "xbc220-20MAY_alltissue_positions_list.csv",
+        "merList220_20-MAY.tsv",
+    ),
+})
+
+BARCODE_SETS = tuple(_BARCODE_FILES)
+
+
+@functools.cache
+def barcode_paths(barcode_set: str) -> MappingProxyType:
+    """Return the positions/bca/bcb paths for `barcode_set`."""
+    return _barcode_entry(*_BARCODE_FILES[barcode_set])
+
+
+class _BarcodePaths(Mapping):
+    """Read-only view of the catalog that resolves entries on lookup."""
+
+    def __getitem__(self, barcode_set: str) -> MappingProxyType:
+        return barcode_paths(barcode_set)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(BARCODE_SETS)
+
+    def __len__(self) -> int:
+        return len(BARCODE_SETS)
+
+
+BARCODE_PATHS = _BarcodePaths()
@@ -1,5 +1,4 @@
 import logging
-import warnings
 from pathlib import Path
 
 import numpy as np
@@ -7,10 +6,66 @@ import pandas as pd
 import plotly.graph_objects as go
 import plotly.io as pio
 from plotly.subplots import make_subplots
-from scipy.stats import gaussian_kde
 
 logger = logging.getLogger(__name__)
 
+# Bounds on the number of bins the data are gridded onto in _fft_kde; within
+# them, bins are sized to a fraction of the bandwidth.
+KDE_MIN_BINS = 512
+KDE_MAX_BINS = 1 << 16
+
+
+def _fft_kde(values: np.ndarray, grid: np.ndarray) -> np.ndarray:
+    """Gaussian KDE of `values` evaluated at `grid`.
+
+    Uses Scott's rule bandwidth, as scipy's gaussian_kde does, but bins the
+    data linearly and convolves with the kernel by FFT, so cost scales with
+    the bin count rather than len(values) * len(grid).
+    """
+    values = np.asarray(values, dtype=np.float64)
+    n = values.size
+    bw = values.std(ddof=1) * n ** (-1 / 5) if n > 1 else 0.0
+    if not bw > 0:
+        return np.zeros_like(grid, dtype=np.float64)
+
+    lo = min(values.min(), grid.min()) - 4 * bw
+    hi = max(values.max(), grid.max()) + 4 * bw
+    bins = int(
+        np.clip(np.ceil(8 * (hi - lo) / bw), KDE_MIN_BINS, KDE_MAX_BINS)
+    )
+    dx = (hi - lo) / (bins - 1)
+
+    # Linear binning: split each point's weight between its two nearest bins.
+    pos = (values - lo) / dx
+    left = np.floor(pos).astype(np.int64)
+    frac = pos - left
+    counts = np.bincount(left, weights=1 - frac, minlength=bins + 1)
+    counts += np.bincount(left + 1, weights=frac, minlength=bins + 1)
+    counts = counts[:bins]
+
+    half = min(int(np.ceil(4 * bw / dx)), bins - 1)
+    offsets = np.arange(-half, half + 1) * dx
+    kernel = np.exp(-0.5 * (offsets / bw) ** 2) / (bw * np.sqrt(2 * np.pi))
+
+    size = bins + kernel.size - 1
+    smoothed = np.fft.irfft(
+        np.fft.rfft(counts, size) * np.fft.rfft(kernel, size), size
+    )[half:half + bins] / n
+
+    centers = lo + np.arange(bins) * dx
+    return np.interp(grid, centers, np.clip(smoothed, 0, None))
+
+
+def _format_channels(channel_raw: pd.Series, offset: int = 0) -> np.ndarray:
+    """Format numeric channels (plus `offset`) as integer strings, with "NA"
+    for missing values, without a per-row Python call.
+    """
+    arr = channel_raw.to_numpy(dtype=np.float64, na_value=np.nan) + offset
+    present = ~np.isnan(arr)
+    out = np.full(arr.shape, "NA", dtype=object)
+    out[present] = np.trunc(arr[present]).astype(np.int64).astype(str)
+    return out
+
 
 def create_density_plot(
     dataframe: pd.DataFrame,
@@ -25,10 +80,10 @@ def create_density_plot(
     """Generate and save a density plot; used downstream to plot the
     distribution of counts per barcode (_denseOnOff.png').
     """
-    groups = [
-        g for g in dataframe[group_column].dropna().unique()
-        if len(dataframe[dataframe[group_column] == g]) > 0
-    ]
+    # One groupby pass instead of re-masking the whole table per group;
+    # sort=False keeps groups in order of first appearance.
+    grouped = dataframe.groupby(group_column, dropna=True, sort=False)
+    groups = list(grouped.groups)
 
     if len(groups) == 0:
         logger.debug("No non-empty groups to plot in density plot.")
@@ -38,26 +93,24 @@ def create_density_plot(
     fig = go.Figure()
 
     for idx, group in enumerate(groups):
-        group_df = dataframe[dataframe[group_column] == group]
-        values = pd.to_numeric(group_df[data_column], errors="coerce").dropna()
+        group_values = grouped.get_group(group)[data_column]
+        values = pd.to_numeric(group_values, errors="coerce").dropna()
         values = values[values > 0]
         if values.empty:
             continue
 
         if log10:
             log_vals = np.log10(values)
-            kde = gaussian_kde(log_vals)
             xs = np.linspace(
                 max(log_vals.min(), 0),
                 log_vals.max(),
                 300,
             )
-            ys = kde(xs)
+            ys = _fft_kde(log_vals, xs)
             xs_plot = np.power(10, xs)
         else:
-            kde = gaussian_kde(values)
             xs_plot = np.linspace(0, min(values.max(), 10000), 300)
-            ys = kde(xs_plot)
+            ys = _fft_kde(values, xs_plot)
 
         fig.add_trace(
             go.Scatter(
@@ -119,17 +172,20 @@ def create_heatmap(
 ):
     '''Create spatial heatmap arranged by row/column, colored by read counts'''
 
-    # Pivot the dataframe to create a matrix
+    # Pivot the dataframe to create a matrix; work on its ndarray so log10 is
+    # one ufunc pass rather than a per-column DataFrame dispatch.
     matrix = df.pivot(index='row', columns='col', values=countCol)
+    values = matrix.to_numpy(dtype=np.float64)
     cbLbl = "counts"
 
     # Take the log10 of the values in the matrix
-    with warnings.catch_warnings():
-        # if there is a zero, log10 throws a warning.
-        # ignoring that warning
-        warnings.simplefilter("ignore", RuntimeWarning)
+    # if there is a zero, log10 warns; ignoring that warning
+    with np.errstate(divide="ignore", invalid="ignore"):
         if log10:
-            matrix = np.log10(matrix)
+            values = np.log10(values)
+            matrix = pd.DataFrame(
+                values, index=matrix.index, columns=matrix.columns
+            )
             cbLbl = "log10 of counts"
             if vmin is not None:
                 vmin = np.log10(vmin)
@@ -144,7 +200,9 @@ def create_heatmap(
 
     fig = go.Figure(
         data=go.Heatmap(
-            z=matrix.values,
+            # Three decimals is beyond what the colour scale can show and
+            # keeps the serialized numbers short.
+            z=np.round(values, 3),
             x=matrix.columns.astype(str),
             y=matrix.index.astype(str),
             colorscale=colorscale,
@@ -245,12 +303,11 @@ def hilo_plot(
     upper = mean * 2
 
     labels = df[label_col].astype(str).tolist()
-    x_vals = list(range(len(df)))
+    # Hand plotly plain arrays rather than Python lists / Series.
+    x_vals = np.arange(len(df))
 
     channel_raw = pd.to_numeric(df[xval], errors="coerce")
-    channel_vals = channel_raw.map(
-        lambda v: str(int(v)) if pd.notna(v) else "NA"
-    )
+    channel_vals = _format_channels(channel_raw)
     customdata = np.column_stack([labels, channel_vals])
 
     flagged = pd.Series(False, index=df.index)
@@ -263,7 +320,7 @@ def hilo_plot(
     fig = go.Figure(
         data=go.Bar(
             x=x_vals,
-            y=y,
+            y=y.to_numpy(),
             marker_color=bar_colors,
             customdata=customdata,
             hovertemplate=(
@@ -355,13 +412,14 @@ def pareto_plot(
     # Ensure endI doesn't exceed dataframe length
     endI = min(endI, len(df))
 
-    # Filter to only valid (non-NaN, finite) values
-    slice_data = df[startI:endI].copy()
-    slice_data = slice_data[
-        (slice_data[y_col1].notna()) &
-        (slice_data[y_col1] > 0) &
-        (np.isfinite(slice_data[y_col1]))
-    ]
+    # Filter to only valid (non-NaN, finite, positive) values in one NumPy
+    # pass over the plotted range, then take those rows without a copy of
+    # the whole slice.
+    vals = df[y_col1].iloc[startI:endI].to_numpy(
+        dtype=np.float64, na_value=np.nan
+    )
+    keep = np.flatnonzero(np.isfinite(vals) & (vals > 0)) + startI
+    slice_data = df.iloc[keep]
 
     if len(slice_data) == 0:
         logger.warning(f"No valid data for pareto plot: {file_name}")
@@ -393,16 +451,15 @@ def pareto_plot(
 
     labels0 = list(slice_data.index)
     channel_raw = pd.to_numeric(slice_data[channel_label], errors="coerce")
-    chan_labels = channel_raw.map(
-        lambda v: f"_{int(v + 1):02d}" if pd.notna(v) else "_NA"
+    channel_vals = _format_channels(channel_raw, offset=1)
+    labels3 = (
+        pd.Series(labels0, dtype=object).astype(str)
+        + "_"
+        + pd.Series(channel_vals, dtype=object).str.zfill(2)
     ).tolist()
-    labels3 = [f"{lb}{cb}" for lb, cb in zip(labels0, chan_labels)]
 
     s = slice_data[colorby].astype(bool)
     marker_colors = np.where(s, "green", "#1f2937")
-    channel_vals = channel_raw.map(
-        lambda v: str(int(v + 1)) if pd.notna(v) else "NA"
-    )
     status_vals = np.where(s, "Expected", "Unexpected")
     customdata = np.column_stack([labels0, channel_vals, status_vals])
 
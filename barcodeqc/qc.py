@@ -2,7 +2,9 @@ from __future__ import annotations
 
 import logging
 import pandas as pd
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
+from types import MappingProxyType
 from typing import Literal, Optional
 
 import barcodeqc.files as files
@@ -11,7 +13,7 @@ import barcodeqc.plots as plots
 import barcodeqc.report as report
 import barcodeqc.utils as utils
 from barcodeqc.logging import (
-    format_hilo_metrics, format_wildcard_metrics
+    format_hilo_metrics, format_wildcard_metrics, worker_pool_kwargs
 )
 from barcodeqc.config import QCConfig
 from barcodeqc.steps import (
@@ -30,6 +32,17 @@ from barcodeqc.steps import (
 
 logger = logging.getLogger(__name__)
 
+# Summary table rows in report order, keyed by metric name.
+_SUMMARY_DESCRIPTIONS = MappingProxyType({
+    "Linker 1 Filter": "Reads are filtered on the sequence identity of the first ligation linker (L1); reads with more than 3 mismatches are removed from processing. PASS: >70% of reads kept. A low passing rate can indicate poor quality sequencing.",
+    "Linker 2 Filter": "Reads are filtered on the sequence identity of the second ligation linker (L2); reads with more than 3 mismatches are removed from processing. PASS: >70% of reads kept. A low passing rate can indicate poor quality sequencing.",
+    "Barcode A Check": "Detected Barcode A 8mers are compared against a user-defined whitelist. PASS: No unexpected 8mers in the top 100 sequences (sorted by read count); CAUTION: >=1 unexpected sequences.  Unexpected sequences can indicate a mismatch between the barcodes used and the whitelist selected for processing.",
+    "Barcode B Check": "Detected Barcode B 8mers are compared against a user-defined whitelist. PASS: No unexpected 8mers in the top 100 sequences (sorted by read count); CAUTION: >=1 unexpected sequences.  Unexpected sequences can indicate a mismatch between the barcodes used and the whitelist selected for processing.",
+    "HIGH Lanes": "Reads with >2x the mean read count per row/col are flagged: PASS: no high lanes; CAUTION: one or more high lanes detected. Please navigate to the Lane QC section for more details.",
+    "LOW Lanes": "Reads with <0.5x the mean read count per row/col are flagged: PASS: no low lanes; CAUTION: one or more low lanes detected. Please navigate to the Lane QC section for more details.",
+})
+_OFF_TISSUE_DESCRIPTION = "Ratio of reads from off-tissue pixels to on-tissue pixels. On/off pixels are defined by the user-supplied tissue_positions_file; if no file was supplied, all pixels are considered 'on-tissue' and the ratio is 0.  A high ratio can indicate incorrect on/off tissue assignment in AtlasXBrowser or procedural artifacts."
+
 
 def qc(
     sample_name: str,
@@ -42,6 +55,12 @@ def qc(
     tissue_position_file: Optional[Path],
     count_raw_reads: bool = False,
 ) -> Path:
+    """Run barcode QC for one sample and return the spatial table path.
+
+    8mer counting and figure rendering run in worker processes started with
+    the forkserver (or spawn) method, so scripts that call qc() must do so
+    under an ``if __name__ == "__main__":`` guard.
+    """
 
     # Setup
     config = QCConfig.from_args(
@@ -86,10 +105,10 @@ def qc(
             "Use --count_raw_reads to enable."
         )
 
-    bca_file = paths.BARCODE_PATHS[barcode_set]["bca"]
+    bca_file = paths.barcode_paths(barcode_set)["bca"]
     bca_positions = files.open_barcode_file(bca_file)
 
-    bcb_file = paths.BARCODE_PATHS[barcode_set]["bcb"]
+    bcb_file = paths.barcode_paths(barcode_set)["bcb"]
     bcb_positions = files.open_barcode_file(bcb_file)
 
     # Run subsample command with seqtk
@@ -128,120 +147,141 @@ def qc(
     hi_lane_statuses: list[str] = []
     lo_lane_statuses: list[str] = []
 
-    for wc, logF, eL, bcl, rc in zip(
-        wc_list, logList, expList, bc_list, row_col
-    ):
-
-        logger.info(f"Processing 8mer counts for {eL}")
-        logger.debug(f"wcFile: {wc}\tlog: {logF}\tsample: {eL}")
-
-        (
-            count_table,
-            unique_counts,
-            expected_bcs,
-            numToNinety,
-            whitelist,
-            valid_capture_reads,
-            empty_capture_reads,
-        ) = build_count_table(wc, bcl, rc)
-
-        count_table.to_csv(tables_dir / f'{eL}_counts.csv', index=True)
-        total_read_from_expected = count_table['frac_count'][
-            count_table['expectMer']
-        ].sum()
-
-        countTableList.append(count_table)
-
-        total_reads_str, adapter_reads_str = utils.parse_read_log(logF)
-        total_reads = int(total_reads_str)
-        adapter_reads = int(adapter_reads_str)
-        utils.log_barcode_capture_quality(
-            eL,
-            adapter_reads,
-            valid_capture_reads,
-            empty_capture_reads,
-        )
-        logger.debug(
-            format_wildcard_metrics(
-                wc.name,
-                total_reads,
-                adapter_reads,
-                len(unique_counts),
-                numToNinety,
-                len(expected_bcs),
-                len(whitelist),
-                total_read_from_expected,
-            )
+    # Counting 8mers and rendering figures are CPU-bound and independent per
+    # lane, so both run in worker processes, and per-lane tables are written
+    # from threads so disk flushes overlap the next lane's work; the metrics
+    # and status bookkeeping stay in lane order here.
+    logger.info(f"Processing 8mer counts for {', '.join(expList)}")
+    plot_futures = []
+    csv_futures = []
+    with ProcessPoolExecutor(
+        max_workers=len(wc_list), **worker_pool_kwargs()
+    ) as pool, ThreadPoolExecutor(max_workers=2) as io_pool:
+        count_results = list(
+            pool.map(build_count_table, wc_list, bc_list, row_col)
         )
-        linker_metrics[eL] = {
-            "Total Reads": total_reads,
-            "Total with Linker": adapter_reads,
-            "Percent Pass Filtering": (
-                f"{(adapter_reads / total_reads):.1%}"
-                if total_reads > 0
-                else "NA"
-            ),
-            "Number of Unique Barcodes": len(unique_counts),
-            "Number Barcodes with 90% of reads": numToNinety,
-            "Percent reads in expected barcodes": f"{total_read_from_expected:.1%}",
-        }
-        linker_status[eL] = linker_conservation_status(
-            total_reads,
-            adapter_reads,
-        )
-        barcode_status[eL] = barcode_check_status(count_table)
 
-        if numToNinety > maxToNinety:
-            maxToNinety = numToNinety
+        for wc, logF, eL, count_result in zip(
+            wc_list, logList, expList, count_results
+        ):
 
-        logger.info(f"Identifying hi/lo barcodes for {eL}...")
-        bc_table, totalHiWarn, totalLoWarn, totalMers = compute_hi_lo_qc(
-            count_table
-        )
+            logger.debug(f"wcFile: {wc}\tlog: {logF}\tsample: {eL}")
 
-        logger.debug(
-            format_hilo_metrics(eL, totalHiWarn, totalLoWarn, totalMers)
-        )
-        hi_lane_statuses.append(lane_status(bc_table, "hiWarn"))
-        lo_lane_statuses.append(lane_status(bc_table, "loWarn"))
+            (
+                count_table,
+                unique_counts,
+                expected_bcs,
+                numToNinety,
+                whitelist,
+                valid_capture_reads,
+                empty_capture_reads,
+            ) = count_result
+
+            csv_futures.append(io_pool.submit(
+                count_table.to_csv, tables_dir / f'{eL}_counts.csv', index=True
+            ))
+            total_read_from_expected = count_table['frac_count'][
+                count_table['expectMer']
+            ].sum()
+
+            countTableList.append(count_table)
+
+            total_reads_str, adapter_reads_str = utils.parse_read_log(logF)
+            total_reads = int(total_reads_str)
+            adapter_reads = int(adapter_reads_str)
+            utils.log_barcode_capture_quality(
+                eL,
+                adapter_reads,
+                valid_capture_reads,
+                empty_capture_reads,
+            )
+            logger.debug(
+                format_wildcard_metrics(
+                    wc.name,
+                    total_reads,
+                    adapter_reads,
+                    len(unique_counts),
+                    numToNinety,
+                    len(expected_bcs),
+                    len(whitelist),
+                    total_read_from_expected,
+                )
+            )
+            linker_metrics[eL] = {
+                "Total Reads": total_reads,
+                "Total with Linker": adapter_reads,
+                "Percent Pass Filtering": (
+                    f"{(adapter_reads / total_reads):.1%}"
+                    if total_reads > 0
+                    else "NA"
+                ),
+                "Number of Unique Barcodes": len(unique_counts),
+                "Number Barcodes with 90% of reads": numToNinety,
+                "Percent reads in expected barcodes": f"{total_read_from_expected:.1%}",
+            }
+            linker_status[eL] = linker_conservation_status(
+                total_reads,
+                adapter_reads,
+            )
+            barcode_status[eL] = barcode_check_status(count_table)
 
-        # Only export if there are hi/lows
-        if (totalHiWarn + totalLoWarn) > 0:
+            if numToNinety > maxToNinety:
+                maxToNinety = numToNinety
 
-            subset_expectedTable = bc_table.loc[
-                bc_table['hiWarn'] | bc_table['loWarn']
-            ]
-            subset_expectedTable.to_csv(
-                tables_dir / f"{eL}_hiLoWarn.csv", index=False
+            logger.info(f"Identifying hi/lo barcodes for {eL}...")
+            bc_table, totalHiWarn, totalLoWarn, totalMers = compute_hi_lo_qc(
+                count_table
             )
 
-        logger.info(f"Saving barcode barplot for {eL}...")
-        barplot_path = plots.hilo_plot(
-            bc_table,
-            "channel",
-            "frac_count",
-            "sequence",
-            figures_dir,
-            f"{eL}_barplot.html",
-        )
-        pic_paths.append(barplot_path)
-        logger.info("Barplot saved.")
-
-        # Make pareto chart of barcode abundances, save as _output.pdf ####
-        logger.info(f"Saving pareto plot for {eL}")
-        pareto_path = plots.pareto_plot(
-            count_table,
-            "frac_count",
-            "cumulative_sum",
-            "expectMer",
-            "channel",
-            wc,
-            maxToNinety,
-            figures_dir,
-            f"{eL}_pareto.html",
-        )
-        pic_paths.append(pareto_path)
-        logger.info("Pareto plot saved.")
+            logger.debug(
+                format_hilo_metrics(eL, totalHiWarn, totalLoWarn, totalMers)
+            )
+            hi_lane_statuses.append(lane_status(bc_table, "hiWarn"))
+            lo_lane_statuses.append(lane_status(bc_table, "loWarn"))
+
+            # Only export if there are hi/lows
+            if (totalHiWarn + totalLoWarn) > 0:
+
+                subset_expectedTable = bc_table.loc[
+                    bc_table['hiWarn'] | bc_table['loWarn']
+                ]
+                csv_futures.append(io_pool.submit(
+                    subset_expectedTable.to_csv,
+                    tables_dir / f"{eL}_hiLoWarn.csv",
+                    index=False,
+                ))
+
+            logger.info(f"Saving barcode barplot for {eL}...")
+            plot_futures.append(pool.submit(
+                plots.hilo_plot,
+                bc_table,
+                "channel",
+                "frac_count",
+                "sequence",
+                figures_dir,
+                f"{eL}_barplot.html",
+            ))
+
+            # Make pareto chart of barcode abundances, save as _output.pdf ####
+            logger.info(f"Saving pareto plot for {eL}")
+            plot_futures.append(pool.submit(
+                plots.pareto_plot,
+                count_table,
+                "frac_count",
+                "cumulative_sum",
+                "expectMer",
+                "channel",
+                wc,
+                maxToNinety,
+                figures_dir,
+                f"{eL}_pareto.html",
+            ))
+
+        # Figures keep the L1 barplot, L1 pareto, L2 ... order.
+        pic_paths.extend(future.result() for future in plot_futures)
+        for future in csv_futures:
+            future.result()
+        logger.info("Barplots and pareto plots saved.")
 
     tissue_provided = tissue_position_file is not None
     onoff_df = None
@@ -283,14 +323,6 @@ def qc(
             f"{ratio_row.iloc[0]:.3f}" if not ratio_row.empty else "NA"
         )
 
-    metrics = [
-        "Linker 1 Filter",
-        "Linker 2 Filter",
-        "Barcode A Check",
-        "Barcode B Check",
-        "HIGH Lanes",
-        "LOW Lanes",
-    ]
     statuses = [
         linker_status.get("L1", ("NA", 0.0))[0],
         linker_status.get("L2", ("NA", 0.0))[0],
@@ -299,23 +331,17 @@ def qc(
         hi_lane_summary,
         lo_lane_summary,
     ]
-    descriptions = [
-        "Reads are filtered on the sequence identity of the first ligation linker (L1); reads with more than 3 mismatches are removed from processing. PASS: >70% of reads kept. A low passing rate can indicate poor quality sequencing.",
-        "Reads are filtered on the sequence identity of the second ligation linker (L2); reads with more than 3 mismatches are removed from processing. PASS: >70% of reads kept. A low passing rate can indicate poor quality sequencing.",
-        "Detected Barcode A 8mers are compared against a user-defined whitelist. PASS: No unexpected 8mers in the top 100 sequences (sorted by read count); CAUTION: >=1 unexpected sequences.  Unexpected sequences can indicate a mismatch between the barcodes used and the whitelist selected for processing.",
-        "Detected Barcode B 8mers are compared against a user-defined whitelist. PASS: No unexpected 8mers in the top 100 sequences (sorted by read count); CAUTION: >=1 unexpected sequences.  Unexpected sequences can indicate a mismatch between the barcodes used and the whitelist selected for processing.",
-        "Reads with >2x the mean read count per row/col are flagged: PASS: no high lanes; CAUTION: one or more high lanes detected. Please navigate to the Lane QC section for more details.",
-        "Reads with <0.5x the mean read count per row/col are flagged: PASS: no low lanes; CAUTION: one or more low lanes detected. Please navigate to the Lane QC section for more details.",
-    ]
+    summary_rows = dict(_SUMMARY_DESCRIPTIONS)
     if tissue_provided:
-        metrics.append("Off-tissue Ratio")
+        summary_rows["Off-tissue Ratio"] = _OFF_TISSUE_DESCRIPTION
         statuses.append(off_tissue_ratio)
-        descriptions.append(
-            "Ratio of reads from off-tissue pixels to on-tissue pixels. On/off pixels are defined by the user-supplied tissue_positions_file; if no file was supplied, all pixels are considered 'on-tissue' and the ratio is 0.  A high ratio can indicate incorrect on/off tissue assignment in AtlasXBrowser or procedural artifacts."
-        )
 
     summary_table = pd.DataFrame(
-        {"metric": metrics, "status": statuses, "description": descriptions}
+        {
+            "metric": list(summary_rows),
+            "status": statuses,
+            "description": list(summary_rows.values()),
+        }
     )
     report.print_summary_table(summary_table)
     input_params = [
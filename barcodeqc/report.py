@@ -4,6 +4,7 @@ from pathlib import Path
 from typing import Iterable, Optional
 
 import base64
+import functools
 import pandas as pd
 import sys
 
@@ -15,6 +16,8 @@ import barcodeqc.paths as bq_paths
 import barcodeqc.files as bq_files
 
 
+# Static assets ship with the package, so each is read and encoded once.
+@functools.lru_cache(maxsize=None)
 def _load_static_image(filename: str) -> str | None:
     image_path = files("barcodeqc") / "data" / "static" / filename
     if not image_path.is_file():
@@ -22,6 +25,7 @@ def _load_static_image(filename: str) -> str | None:
     return _image_data_uri(image_path)
 
 
+@functools.lru_cache(maxsize=None)
 def _load_static_text(filename: str) -> str | None:
     text_path = files("barcodeqc") / "data" / "static" / filename
     if not text_path.is_file():
@@ -55,6 +59,12 @@ def write_input_params(
     return out_path
 
 
+@functools.lru_cache(maxsize=1)
+def _compile_template(source: str) -> Template:
+    """Parse and compile the report template once per process."""
+    return Template(source)
+
+
 def _image_data_uri(path: Path) -> str:
     with open(path, "rb") as image_file:
         encoded = base64.b64encode(image_file.read()).decode("utf-8")
@@ -807,7 +817,7 @@ def generate_report(
 </html>
     """
 
-    template = Template(html_template)
+    template = _compile_template(html_template)
     html_content = template.render(
         sample_name=sample_name,
         css_text=css_text,
@@ -869,7 +879,13 @@ def load_linker_metrics_from_dir(
         total_reads = int(total_reads_str)
         adapter_reads = int(adapter_reads_str)
 
-        count_df = pd.read_csv(count_path)
+        # Only these columns feed the metrics; older tables may lack some.
+        count_df = pd.read_csv(
+            count_path,
+            usecols=lambda col: col in {
+                "frac_count", "cumulative_sum", "expectMer"
+            },
+        )
         if "frac_count" not in count_df.columns:
             continue
 
@@ -879,11 +895,14 @@ def load_linker_metrics_from_dir(
             sorted_frac = count_df["frac_count"].sort_values(ascending=False)
             num_to_ninety = int((sorted_frac.cumsum() <= 0.9).sum())
 
-        frac_sorted = count_df["frac_count"].sort_values(ascending=False)
         if "expectMer" in count_df.columns:
-            expected_mask = count_df["expectMer"].astype(str).str.lower().isin(
-                ["true", "1"]
-            )
+            expected_mask = count_df["expectMer"]
+            # qc() writes a bool column, which read_csv parses back as bool;
+            # only hand-edited tables need the string comparison.
+            if not pd.api.types.is_bool_dtype(expected_mask):
+                expected_mask = expected_mask.astype(str).str.lower().isin(
+                    ["true", "1"]
+                )
             total_read_from_expected = count_df.loc[
                 expected_mask, "frac_count"
             ].sum()
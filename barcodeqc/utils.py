@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import functools
 import logging
 import re
 
@@ -10,6 +11,8 @@ import gzip
 
 logger = logging.getLogger(__name__)
 
+ACGT_WORD_PATTERN = re.compile(r'^[ACGTN]{8,}$')
+
 
 class ExternalDependencyError(RuntimeError):
     pass
@@ -22,11 +25,10 @@ class InputFastqError(ValueError):
 def contains_acgt_word(input_list: List[str]) -> List[int]:
     '''Function to check for 8-character word made up of A, C, G, T in a list
     and return indices.'''
-    pattern = re.compile(r'^[ACGTN]{8,}$')
     return [
         index
         for index, item in enumerate(input_list)
-        if isinstance(item, str) and pattern.search(item)
+        if isinstance(item, str) and ACGT_WORD_PATTERN.search(item)
     ]
 
 
@@ -126,6 +128,7 @@ def log_barcode_capture_quality(
         logger.info("%s", message)
 
 
+@functools.lru_cache(maxsize=None)
 def require_executable(name: str) -> str:
     exe = which(name)
     if not exe:
@@ -135,8 +138,19 @@ def require_executable(name: str) -> str:
     return exe
 
 
+def _gzip_opener():
+    """Prefer ISA-L's igzip (installed alongside cutadapt) for decompression;
+    it is roughly twice as fast as the stdlib gzip module.
+    """
+    try:
+        from isal import igzip
+    except ImportError:
+        return gzip.open
+    return igzip.open
+
+
 def count_fastq_reads(path: Path) -> int:
-    opener = gzip.open if path.suffix in {".gz", ".gzip"} else open
+    opener = _gzip_opener() if path.suffix in {".gz", ".gzip"} else open
     line_count = 0
     with opener(path, "rb") as handle:
         for chunk in iter(lambda: handle.read(1024 * 1024), b""):
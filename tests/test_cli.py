@@ -1,5 +1,9 @@
 from __future__ import annotations
 
+import argparse
+import subprocess
+import sys
+
 from pathlib import Path
 
 import barcodeqc.cli as cli
@@ -53,6 +57,18 @@ def test_run_qc_invokes_pipeline(monkeypatch, tmp_path: Path) -> None:
     assert spatial_table.exists()
 
 
+def test_main_resolves_output_dir_without_parse_args(
+    monkeypatch, tmp_path: Path
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    args = argparse.Namespace(
+        command="qc", sample_name="sample", dry_run=True
+    )
+
+    assert cli.main(args) == cli.EX_OK
+    assert (tmp_path / "sample_outputs").is_dir()
+
+
 def test_run_maps_external_dependency_error(monkeypatch, tmp_path: Path) -> None:
     monkeypatch.setattr(cli, "setup_logging", lambda **kwargs: None)
     monkeypatch.setattr(
@@ -89,3 +105,14 @@ def test_report_command_generates_output_from_existing_run(
 
     assert code == cli.EX_OK
     assert (out_dir / "example_bcQC_report.html").exists()
+
+
+def test_package_qc_export_is_function_after_submodule_import() -> None:
+    # Run in a fresh interpreter so no earlier test has imported barcodeqc.qc.
+    code = (
+        "import barcodeqc.qc\n"
+        "from barcodeqc import qc\n"
+        "import barcodeqc\n"
+        "assert callable(qc) and qc is barcodeqc.qc, type(qc)\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
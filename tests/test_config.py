@@ -78,6 +78,21 @@ def test_qcconfig_validate_raises_for_missing_fastq(tmp_path: Path) -> None:
         config.validate()
 
 
+def test_qcconfig_validate_rejects_directory_fastq(tmp_path: Path) -> None:
+    config = QCConfig(
+        sample_name="sample",
+        r2_path=tmp_path,
+        barcode_set="bc50",
+        sample_reads=1000,
+        random_seed=42,
+        tissue_position_file=None,
+        output_dir=tmp_path / "out",
+    )
+
+    with pytest.raises(IsADirectoryError, match="found a directory"):
+        config.validate()
+
+
 def test_qcconfig_validate_raises_for_missing_positions(
     monkeypatch,
     tmp_path: Path,
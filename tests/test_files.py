@@ -21,6 +21,16 @@ def test_open_barcode_file_accepts_builtin_fixture() -> None:
     assert not barcodes.empty
 
 
+def test_open_barcode_file_returns_independent_copies() -> None:
+    path = paths.BARCODE_PATHS["bc50"]["bca"]
+    first = open_barcode_file(path)
+    first["row"] = -1
+
+    second = open_barcode_file(path)
+
+    assert (second["row"] >= 0).all()
+
+
 def test_open_barcode_file_rejects_bad_sequence(tmp_path: Path) -> None:
     path = tmp_path / "bad_barcodes.csv"
     path.write_text(
@@ -32,6 +42,28 @@ def test_open_barcode_file_rejects_bad_sequence(tmp_path: Path) -> None:
         open_barcode_file(path)
 
 
+def test_open_barcode_file_rejects_fractional_row(tmp_path: Path) -> None:
+    path = tmp_path / "bad_rows.csv"
+    path.write_text(
+        "sequence,row,col\nAAAACCCC,1.5,2\n",
+        encoding="utf-8",
+    )
+
+    with pytest.raises(BarcodeFileError, match="must contain integer values"):
+        open_barcode_file(path)
+
+
+def test_open_positions_file_rejects_negative_col(tmp_path: Path) -> None:
+    path = tmp_path / "positions.csv"
+    path.write_text(
+        "AAAACCCCGGGGTTTT,1,0,-1\n",
+        encoding="utf-8",
+    )
+
+    with pytest.raises(BarcodeFileError, match="col column contains negative"):
+        open_positions_file(path)
+
+
 def test_open_positions_file_strips_trailing_dash_one(tmp_path: Path) -> None:
     path = tmp_path / "positions.csv"
     path.write_text(
@@ -48,6 +80,19 @@ def test_open_positions_file_strips_trailing_dash_one(tmp_path: Path) -> None:
     assert positions["on_off"].tolist() == [1, 0]
 
 
+def test_open_positions_file_rejects_non_string_barcodes(
+    tmp_path: Path,
+) -> None:
+    path = tmp_path / "positions.csv"
+    path.write_text(
+        "AAAACCCCGGGGTTTT,1,0,1\n,0,1,2\n",
+        encoding="utf-8",
+    )
+
+    with pytest.raises(BarcodeFileError, match="Non-string barcodes detected"):
+        open_positions_file(path)
+
+
 def test_open_positions_file_rejects_invalid_on_off(tmp_path: Path) -> None:
     path = tmp_path / "positions.csv"
     path.write_text(
@@ -59,6 +104,33 @@ def test_open_positions_file_rejects_invalid_on_off(tmp_path: Path) -> None:
         open_positions_file(path)
 
 
+def test_open_positions_file_accepts_ragged_rows(tmp_path: Path) -> None:
+    path = tmp_path / "positions.csv"
+    path.write_text(
+        "AAAACCCCGGGGTTTT,1,0,1,extra\nTTTTGGGGCCCCAAAA,0,1,2\n",
+        encoding="utf-8",
+    )
+
+    positions = open_positions_file(path)
+
+    assert positions["barcodes"].tolist() == [
+        "AAAACCCCGGGGTTTT",
+        "TTTTGGGGCCCCAAAA",
+    ]
+    assert positions["col"].tolist() == [1, 2]
+
+
+def test_open_positions_file_rejects_short_row(tmp_path: Path) -> None:
+    path = tmp_path / "positions.csv"
+    path.write_text(
+        "AAAACCCCGGGGTTTT,1,0,1\nTTTTGGGGCCCCAAAA,0\nGGGGTTTTAAAACCCC,1,2,3\n",
+        encoding="utf-8",
+    )
+
+    with pytest.raises(BarcodeFileError):
+        open_positions_file(path)
+
+
 def test_load_wc_file_accepts_valid_fixture(tmp_path: Path) -> None:
     path = tmp_path / "wc.txt"
     path.write_text(
@@ -149,3 +221,35 @@ def test_load_wc_file_rejects_short_input(tmp_path: Path) -> None:
 
     with pytest.raises(WildcardFileError, match="Fewer than 6 reads found"):
         load_wc_file(path)
+
+
+def test_load_wc_file_fallback_matches_pyarrow_reader(
+    monkeypatch, tmp_path: Path
+) -> None:
+    pytest.importorskip("pyarrow")
+    path = tmp_path / "wc.txt"
+    path.write_text(
+        "\n".join(
+            [
+                "AAAACCCC read1 1:N",
+                " read2 1:N",
+                "",
+                "AAAANNNN\tread3",
+                "AAAACCCCx read4",
+                "  TTTTGGGG   read5",
+                "read6",
+            ]
+        )
+        + "\n",
+        encoding="utf-8",
+    )
+
+    fast = load_wc_file(path)
+    monkeypatch.setattr("barcodeqc.files._csv_engine", lambda: "c")
+    slow = load_wc_file(path)
+
+    assert fast["8mer"].tolist() == slow["8mer"].tolist()
+    assert fast["readName"].tolist() == slow["readName"].tolist()
+    assert fast["8mer"].tolist() == [
+        "AAAACCCC", "", "AAAANNNN", "", "TTTTGGGG", ""
+    ]
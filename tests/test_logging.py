@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import logging
+import time
+
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import barcodeqc.logging as bq_logging
+
+
+def _log_from_worker(message: str) -> None:
+    logging.getLogger("barcodeqc.plots").warning(message)
+
+
+def test_worker_process_records_reach_log_file(tmp_path: Path) -> None:
+    root = logging.getLogger()
+    saved_handlers = list(root.handlers)
+    saved_level = root.level
+    log_path = tmp_path / "barcodeqc.log"
+    try:
+        bq_logging.setup_logging(log_file=log_path)
+        with ProcessPoolExecutor(
+            max_workers=1, **bq_logging.worker_pool_kwargs()
+        ) as pool:
+            pool.submit(_log_from_worker, "from worker").result()
+        logging.getLogger("barcodeqc").info("from parent")
+    finally:
+        bq_logging._stop_file_listener()
+        root.handlers[:] = saved_handlers
+        root.setLevel(saved_level)
+
+    text = log_path.read_text()
+    assert "from worker" in text
+    assert "from parent" in text
+
+
+def test_log_file_is_flushed_before_shutdown(tmp_path: Path) -> None:
+    root = logging.getLogger()
+    saved_handlers = list(root.handlers)
+    saved_level = root.level
+    log_path = tmp_path / "barcodeqc.log"
+    try:
+        bq_logging.setup_logging(log_file=log_path)
+        logging.getLogger("barcodeqc").info("still running")
+        deadline = time.monotonic() + 5
+        while "still running" not in log_path.read_text():
+            assert time.monotonic() < deadline, "log file was never flushed"
+            time.sleep(0.1)
+    finally:
+        bq_logging._stop_file_listener()
+        root.handlers[:] = saved_handlers
+        root.setLevel(saved_level)
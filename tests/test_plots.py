@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+import numpy as np
+from scipy.stats import gaussian_kde
+
+from barcodeqc.plots import _fft_kde
+
+
+def test_fft_kde_matches_gaussian_kde() -> None:
+    rng = np.random.default_rng(0)
+    values = np.log10(rng.lognormal(5, 1.5, 5000))
+    grid = np.linspace(max(values.min(), 0), values.max(), 300)
+
+    expected = gaussian_kde(values)(grid)
+    result = _fft_kde(values, grid)
+
+    np.testing.assert_allclose(result, expected, atol=1e-3 * expected.max())
+
+
+def test_fft_kde_constant_values_returns_zeros() -> None:
+    grid = np.linspace(0, 10, 50)
+
+    result = _fft_kde(np.full(20, 3.0), grid)
+
+    assert result.shape == grid.shape
+    assert not result.any()
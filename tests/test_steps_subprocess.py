@@ -1,8 +1,15 @@
 from __future__ import annotations
 
+import gzip
+import os
+import shutil
+import subprocess
+
 from pathlib import Path
 from types import SimpleNamespace
 
+import pytest
+
 from barcodeqc.config import QCConfig
 from barcodeqc.steps import run_cutadapt, run_subsample
 
@@ -54,6 +61,116 @@ def test_run_subsample_prefers_pigz(monkeypatch, tmp_path: Path) -> None:
     assert calls["gzip"] == ["/usr/bin/pigz", "-1"]
 
 
+def test_run_subsample_falls_back_to_igzip(monkeypatch, tmp_path: Path) -> None:
+    calls: dict[str, list[str]] = {}
+
+    def fake_run(cmd, stdin=None, stdout=None, check=None):
+        calls["gzip"] = cmd
+        return SimpleNamespace(returncode=0)
+
+    monkeypatch.setattr(
+        "barcodeqc.steps.which",
+        lambda name: "/usr/bin/igzip" if name == "igzip" else None,
+    )
+    monkeypatch.setattr(
+        "barcodeqc.steps.subprocess.Popen",
+        lambda cmd, stdout=None: DummyPopen(),
+    )
+    monkeypatch.setattr("barcodeqc.steps.subprocess.run", fake_run)
+
+    config = QCConfig(
+        sample_name="sample",
+        r2_path=tmp_path / "reads.fastq.gz",
+        barcode_set="bc50",
+        sample_reads=1000,
+        random_seed=13,
+        tissue_position_file=None,
+        output_dir=tmp_path / "out",
+    )
+
+    run_subsample(config, tmp_path)
+
+    assert calls["gzip"] == ["/usr/bin/igzip", "-1", "-c"]
+
+
+@pytest.mark.parametrize(
+    ("compressor", "hidden"),
+    [("igzip", {"pigz"}), ("gzip", {"pigz", "igzip"})],
+)
+def test_run_subsample_writes_gzip_output(
+    monkeypatch, tmp_path: Path, compressor: str, hidden: set[str]
+) -> None:
+    if shutil.which(compressor) is None:
+        pytest.skip(f"{compressor} is not installed")
+
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    seqtk = bin_dir / "seqtk"
+    seqtk.write_text("#!/bin/sh\nprintf '@r1\\nACGT\\n+\\nIIII\\n'\n")
+    seqtk.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{bin_dir}:{os.environ['PATH']}")
+    # Hide the faster compressors so `compressor` is the one selected.
+    monkeypatch.setattr(
+        "barcodeqc.steps.which",
+        lambda name: None if name in hidden else shutil.which(name),
+    )
+
+    config = QCConfig(
+        sample_name="sample",
+        r2_path=tmp_path / "reads.fastq.gz",
+        barcode_set="bc50",
+        sample_reads=1,
+        random_seed=13,
+        tissue_position_file=None,
+        output_dir=tmp_path / "out",
+    )
+
+    ds_path = run_subsample(config, tmp_path)
+
+    with gzip.open(ds_path, "rt") as handle:
+        assert handle.read() == "@r1\nACGT\n+\nIIII\n"
+
+
+def test_run_subsample_reuses_matching_subsample(
+    monkeypatch, tmp_path: Path
+) -> None:
+    seqtk_calls: list[list[str]] = []
+
+    def fake_popen(cmd, stdout=None):
+        seqtk_calls.append(cmd)
+        return DummyPopen()
+
+    def fake_run(cmd, stdin=None, stdout=None, check=None):
+        stdout.write(b"reads")
+        return SimpleNamespace(returncode=0)
+
+    monkeypatch.setattr("barcodeqc.steps.which", lambda name: None)
+    monkeypatch.setattr("barcodeqc.steps.subprocess.Popen", fake_popen)
+    monkeypatch.setattr("barcodeqc.steps.subprocess.run", fake_run)
+
+    r2_path = tmp_path / "reads.fastq.gz"
+    r2_path.write_bytes(b"fastq")
+
+    def make_config(random_seed: int) -> QCConfig:
+        return QCConfig(
+            sample_name="sample",
+            r2_path=r2_path,
+            barcode_set="bc50",
+            sample_reads=1000,
+            random_seed=random_seed,
+            tissue_position_file=None,
+            output_dir=tmp_path / "out",
+        )
+
+    first = run_subsample(make_config(13), tmp_path)
+    second = run_subsample(make_config(13), tmp_path)
+    assert first == second
+    assert len(seqtk_calls) == 1
+
+    run_subsample(make_config(14), tmp_path)
+    assert len(seqtk_calls) == 2
+
+
 def test_run_cutadapt_writes_logs(monkeypatch, tmp_path: Path) -> None:
     calls: list[list[str]] = []
 
@@ -72,9 +189,46 @@ def test_run_cutadapt_writes_logs(monkeypatch, tmp_path: Path) -> None:
     wc1, log1, wc2, log2 = run_cutadapt(ds_path, tmp_path, cores=4)
 
     assert [cmd[0] for cmd in calls] == ["cutadapt", "cutadapt"]
-    assert "--cores" in calls[0]
-    assert "4" in calls[0]
+    # The two concurrent passes split the core budget.
+    for cmd in calls:
+        assert cmd[cmd.index("--cores") + 1] == "2"
     assert log1.exists()
     assert log2.exists()
     assert wc1.name == "cutadapt_wc_L1.txt"
     assert wc2.name == "cutadapt_wc_L2.txt"
+
+
+def test_run_cutadapt_defaults_to_half_the_cpus_per_pass(
+    monkeypatch, tmp_path: Path
+) -> None:
+    calls: list[list[str]] = []
+
+    def fake_run(cmd, stdout=None, stderr=None, check=None):
+        calls.append(cmd)
+        return SimpleNamespace(returncode=0)
+
+    monkeypatch.setattr("barcodeqc.steps.subprocess.run", fake_run)
+    monkeypatch.setattr("barcodeqc.steps.os.cpu_count", lambda: 8)
+
+    ds_path = tmp_path / "reads.fastq.gz"
+    ds_path.write_text("", encoding="utf-8")
+
+    run_cutadapt(ds_path, tmp_path)
+
+    for cmd in calls:
+        assert cmd[cmd.index("--cores") + 1] == "4"
+
+
+def test_run_cutadapt_propagates_failure(monkeypatch, tmp_path: Path) -> None:
+    def fake_run(cmd, stdout=None, stderr=None, check=None):
+        if any("linker2=" in arg for arg in cmd):
+            raise subprocess.CalledProcessError(1, cmd)
+        return SimpleNamespace(returncode=0)
+
+    monkeypatch.setattr("barcodeqc.steps.subprocess.run", fake_run)
+
+    ds_path = tmp_path / "reads.fastq.gz"
+    ds_path.write_text("", encoding="utf-8")
+
+    with pytest.raises(subprocess.CalledProcessError):
+        run_cutadapt(ds_path, tmp_path, cores=4)
@@ -3,6 +3,7 @@ from __future__ import annotations
 from pathlib import Path
 
 import pandas as pd
+import pytest
 
 from barcodeqc.steps import (
     barcode_check_status,
@@ -91,6 +92,36 @@ def test_build_count_table_ignores_empty_barcode_captures(tmp_path: Path) -> Non
     assert set(count_table.index) == {"AAAACCCC", "TTTTGGGG"}
 
 
+def test_build_count_table_orders_ties_by_barcode(tmp_path: Path) -> None:
+    wc_path = tmp_path / "wc.txt"
+    _write_wc_file(
+        wc_path,
+        [
+            ("TTTTGGGG", "read1"),
+            ("CCCCAAAA", "read2"),
+            ("GGGGTTTT", "read3"),
+            ("GGGGTTTT", "read4"),
+            ("AAAACCCC", "read5"),
+            ("CCCCAAAA", "read6"),
+        ],
+    )
+    whitelist = pd.DataFrame(
+        {"sequence": ["AAAACCCC"], "row": [1], "col": [10]}
+    )
+
+    count_table, *_ = build_count_table(wc_path, whitelist, "row")
+
+    assert count_table.index.tolist() == [
+        "CCCCAAAA",
+        "GGGGTTTT",
+        "AAAACCCC",
+        "TTTTGGGG",
+    ]
+    assert count_table["cumulative_sum"].tolist() == pytest.approx(
+        [2 / 6, 4 / 6, 5 / 6, 1.0]
+    )
+
+
 def test_compute_hi_lo_qc_and_lane_status() -> None:
     count_table = pd.DataFrame(
         {
@@ -246,3 +277,51 @@ def test_make_spatial_table_drops_rows_missing_barcode_capture(
     counts = dict(zip(spatial_table["16mer"], spatial_table["count"]))
     assert counts["TTTTGGGGAAAACCCC"] == 3
     assert counts["CCCCAAAAGGGGTTTT"] == 1
+
+
+def test_make_spatial_table_pairs_reads_by_name_when_unaligned(
+    tmp_path: Path,
+) -> None:
+    wc1 = tmp_path / "wc1.txt"
+    wc2 = tmp_path / "wc2.txt"
+    positions = tmp_path / "positions.csv"
+
+    _write_wc_file(
+        wc1,
+        [
+            ("AAAACCCC", "read1"),
+            ("AAAACCCC", "read2"),
+            ("GGGGTTTT", "read3"),
+            ("AAAACCCC", "read4"),
+            ("AAAACCCC", "read5"),
+            ("GGGGTTTT", "read6"),
+        ],
+    )
+    _write_wc_file(
+        wc2,
+        [
+            ("CCCCAAAA", "read6"),
+            ("TTTTGGGG", "read1"),
+            ("TTTTGGGG", "read2"),
+            ("CCCCAAAA", "read3"),
+            ("TTTTGGGG", "read4"),
+            ("TTTTGGGG", "read5"),
+            ("TTTTGGGG", "read7"),
+        ],
+    )
+    positions.write_text(
+        "\n".join(
+            [
+                "TTTTGGGGAAAACCCC,1,0,1",
+                "CCCCAAAAGGGGTTTT,0,1,2",
+            ]
+        )
+        + "\n",
+        encoding="utf-8",
+    )
+
+    spatial_table = make_spatial_table(wc1, wc2, positions)
+
+    counts = dict(zip(spatial_table["16mer"], spatial_table["count"]))
+    assert counts["TTTTGGGGAAAACCCC"] == 4
+    assert counts["CCCCAAAAGGGGTTTT"] == 2